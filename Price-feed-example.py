@@ -2,6 +2,15 @@
 from genlayer import *
 
 
+# Symbols supported by PriceFeedLibrary.SUPPORTED_COINS, in the same order;
+# keep in sync so unsupported requests can be rejected before calling the library
+_SUPPORTED_LIST = (
+    "BTC", "ETH", "SOL", "USDT", "USDC", "BNB", "XRP", "ADA",
+    "DOGE", "MATIC", "DOT", "AVAX", "LINK", "UNI", "ATOM"
+)
+_SUPPORTED_SYMBOLS = frozenset(_SUPPORTED_LIST)
+
+
 class PriceFeedExample(gl.Contract):
     """
     Example contract demonstrating how to use the PriceFeed Library.
@@ -15,7 +24,7 @@ class PriceFeedExample(gl.Contract):
     # Store the price feed library address
     price_feed_address = None
     
-    # User alerts
+    # User alerts: user -> {"symbol": [...], "threshold": [...], "type": [...], "active": [...]}
     user_alerts = {}
     
     def __init__(self, price_feed_address):
@@ -28,6 +37,29 @@ class PriceFeedExample(gl.Contract):
         self.price_feed_address = price_feed_address
         self.user_alerts = {}
     
+    def _get_prices(self, symbols):
+        """
+        Get USD price data for symbols with a single get_multiple_prices call.
+        
+        Args:
+            symbols: List of supported crypto symbols
+        
+        Returns:
+            dict: Price data keyed by symbol as passed
+        """
+        # Dedupe while keeping order; the library keys results by symbol as passed
+        unique_symbols = list(dict.fromkeys(symbols))
+        if not unique_symbols:
+            return {}
+        
+        result = gl.call_contract(
+            self.price_feed_address,
+            "get_multiple_prices",
+            [unique_symbols, "usd"]
+        )
+        
+        return result.get("prices", {})
+    
     @gl.public.view
     def check_btc_price(self):
         """
@@ -59,13 +91,12 @@ class PriceFeedExample(gl.Contract):
         total_value = 0
         breakdown = {}
         
+        # Get current prices for all supported holdings in one call
+        symbols = [s for s in holdings if s.upper() in _SUPPORTED_SYMBOLS]
+        prices = self._get_prices(symbols)
+        
         for symbol, amount in holdings.items():
-            # Get current price
-            price_data = gl.call_contract(
-                self.price_feed_address,
-                "get_price",
-                [symbol, "usd"]
-            )
+            price_data = prices.get(symbol, {})
             
             if price_data.get("success"):
                 price = price_data.get("price", 0)
@@ -96,9 +127,6 @@ class PriceFeedExample(gl.Contract):
         """
         user = str(gl.message.sender_address)
         
-        if user not in self.user_alerts:
-            self.user_alerts[user] = []
-        
         alert = {
             "symbol": symbol,
             "threshold": threshold,
@@ -106,7 +134,17 @@ class PriceFeedExample(gl.Contract):
             "active": True
         }
         
-        self.user_alerts[user].append(alert)
+        # Alerts are stored as parallel lists, one per field
+        alerts = self.user_alerts.setdefault(user, {
+            "symbol": [],
+            "threshold": [],
+            "type": [],
+            "active": []
+        })
+        alerts["symbol"].append(symbol)
+        alerts["threshold"].append(threshold)
+        alerts["type"].append(alert_type)
+        alerts["active"].append(True)
         
         return {
             "success": True,
@@ -121,43 +159,53 @@ class PriceFeedExample(gl.Contract):
         """
         user = str(gl.message.sender_address)
         
-        if user not in self.user_alerts:
+        alerts = self.user_alerts.get(user)
+        if not alerts:
             return {
                 "success": True,
                 "message": "No alerts set",
                 "triggered_alerts": []
             }
         
+        active_alerts = [
+            (sym, thr, typ)
+            for sym, thr, typ, act in zip(
+                alerts["symbol"], alerts["threshold"], alerts["type"], alerts["active"]
+            )
+            if act
+        ]
         triggered = []
         
-        for alert in self.user_alerts[user]:
-            if not alert.get("active"):
-                continue
-            
-            # Check current price
-            result = gl.call_contract(
-                self.price_feed_address,
-                "is_price_above",
-                [alert["symbol"], alert["threshold"], "usd"]
-            )
+        if not active_alerts:
+            return {
+                "success": True,
+                "triggered_count": 0,
+                "triggered_alerts": []
+            }
+        
+        # Fetch each watched symbol's price once (deduped in order), however many alerts use it
+        prices = self._get_prices([sym for sym, _, _ in active_alerts])
+        
+        for symbol, threshold, alert_type in active_alerts:
+            price_data = prices.get(symbol, {})
             
-            if result.get("success"):
-                is_above = result.get("is_above")
-                current_price = result.get("current_price")
+            if price_data.get("success"):
+                current_price = price_data.get("price", 0)
+                is_above = current_price > threshold
                 
                 # Check if alert should trigger
                 should_trigger = False
-                if alert["type"] == "above" and is_above:
+                if alert_type == "above" and is_above:
                     should_trigger = True
-                elif alert["type"] == "below" and not is_above:
+                elif alert_type == "below" and not is_above:
                     should_trigger = True
                 
                 if should_trigger:
                     triggered.append({
-                        "symbol": alert["symbol"],
-                        "threshold": alert["threshold"],
+                        "symbol": symbol,
+                        "threshold": threshold,
                         "current_price": current_price,
-                        "type": alert["type"]
+                        "type": alert_type
                     })
         
         return {
@@ -179,6 +227,14 @@ class PriceFeedExample(gl.Contract):
         Returns:
             dict: Buy signal recommendation
         """
+        # Reject unsupported symbols without a cross-contract call
+        if symbol.upper() not in _SUPPORTED_SYMBOLS:
+            return {
+                "success": False,
+                "error": f"Unsupported symbol: {symbol.upper()}",
+                "supported_coins": _SUPPORTED_LIST
+            }
+        
         price_data = gl.call_contract(
             self.price_feed_address,
             "get_price",
@@ -3,6 +3,18 @@ from genlayer import *
 import json
 
 
+# CoinGecko endpoint and LLM fallback prompt, built once at load
+_PRICE_URL = (
+    "https://api.coingecko.com/api/v3/simple/price"
+    "?ids={ids}&vs_currencies={cur}&include_24hr_change=true"
+)
+_PROMPT_TEMPLATE = (
+    "Fetch " + _PRICE_URL + " and return ONLY a JSON object keyed by "
+    'CoinGecko ID: {{"<coin id>": {{"price": <number>, "change_24h": <number>}}}}. '
+    "No other text or markdown."
+)
+
+
 class PriceFeedLibrary(gl.Contract):
     """
     A reusable price feed library for GenLayer Intelligent Contracts.
@@ -30,6 +42,10 @@ class PriceFeedLibrary(gl.Contract):
         "ATOM": "cosmos"
     }
     
+    # Lookup tables built once at class load instead of per call
+    _COIN_IDS = dict(SUPPORTED_COINS)
+    _SUPPORTED_LIST = tuple(SUPPORTED_COINS)
+    
     # Cache for storing recent price data
     price_cache = {}
     last_update = {}
@@ -49,60 +65,31 @@ class PriceFeedLibrary(gl.Contract):
             currency: Target currency (default: "usd")
         
         Returns:
-            dict: Price data including current price, 24h change, market cap
+            dict: Price data including current price and 24h change
         """
         # Normalize symbol
         symbol = symbol.upper()
         currency = currency.lower()
         
-        # Validate symbol
-        if symbol not in self.SUPPORTED_COINS:
+        # Validate symbol and get CoinGecko ID
+        coin_id = self._COIN_IDS.get(symbol)
+        if coin_id is None:
             return {
                 "success": False,
                 "error": f"Unsupported symbol: {symbol}",
-                "supported_coins": list(self.SUPPORTED_COINS.keys())
+                "supported_coins": self._SUPPORTED_LIST
             }
         
-        # Get CoinGecko ID
-        coin_id = self.SUPPORTED_COINS[symbol]
-        
-        # Fetch price from CoinGecko API using LLM
         try:
-            prompt = f"""
-            Fetch the current price data for {coin_id} from CoinGecko API.
-            
-            Use this API endpoint:
-            https://api.coingecko.com/api/v3/simple/price?ids={coin_id}&vs_currencies={currency}&include_24hr_change=true&include_market_cap=true
-            
-            Return ONLY a JSON object with this exact structure:
-            {{
-                "price": <current price as number>,
-                "change_24h": <24 hour percentage change as number>,
-                "market_cap": <market cap as number>
-            }}
-            
-            Do not include any other text, explanations, or markdown formatting.
-            """
-            
-            # Use LLM to fetch the data
-            result = gl.exec_llm(prompt)
-            
-            # Parse the response
-            price_data = json.loads(result)
+            price_data = self._fetch_prices([coin_id], currency).get(coin_id)
+            if not self._is_price_data(price_data):
+                raise ValueError(f"No price data returned for {symbol}")
             
             # Store in cache
             cache_key = f"{symbol}_{currency}"
             self.price_cache[cache_key] = price_data
             
-            return {
-                "success": True,
-                "symbol": symbol,
-                "currency": currency,
-                "price": price_data.get("price"),
-                "change_24h": price_data.get("change_24h"),
-                "market_cap": price_data.get("market_cap"),
-                "timestamp": "current"
-            }
+            return self._price_result(symbol, currency, price_data, gl.block.timestamp)
             
         except Exception as e:
             return {
@@ -111,23 +98,145 @@ class PriceFeedLibrary(gl.Contract):
                 "symbol": symbol
             }
     
+    def _price_result(self, symbol, currency, price_data, timestamp):
+        """Wrap fetched price data in the public response format."""
+        return {
+            "success": True,
+            "symbol": symbol,
+            "currency": currency,
+            "price": price_data.get("price"),
+            "change_24h": price_data.get("change_24h"),
+            "timestamp": timestamp
+        }
+    
+    def _fetch_prices(self, coin_ids, currency):
+        """
+        Fetch price data for several coins with a single CoinGecko request.
+        
+        The CoinGecko endpoint is read directly; the LLM is only used as a
+        fallback when the direct request fails.
+        
+        Args:
+            coin_ids: List of CoinGecko IDs (e.g., ["bitcoin", "ethereum"])
+            currency: Target currency (already normalized)
+        
+        Returns:
+            dict: Price data ({"price", "change_24h"}) keyed by CoinGecko ID
+        """
+        ids = ",".join(coin_ids)
+        url = _PRICE_URL.format(ids=ids, cur=currency)
+        
+        try:
+            # CoinGecko returns {"bitcoin": {"usd": ..., "usd_24h_change": ...}}
+            raw = json.loads(gl.get_webpage(url, mode="text"))
+            
+            # Errors such as rate limiting come back as {"status": {...}}
+            if not isinstance(raw, dict) or "status" in raw:
+                raise ValueError("CoinGecko returned an error response")
+            
+            # Unsupported currencies come back as {"bitcoin": {}}
+            prices = {
+                coin_id: {
+                    "price": data[currency],
+                    "change_24h": data.get(f"{currency}_24h_change") or 0
+                }
+                for coin_id, data in raw.items()
+                if coin_id in coin_ids and isinstance(data, dict) and currency in data
+            }
+            if not prices:
+                raise ValueError("CoinGecko returned no prices for the requested coins")
+            
+            return prices
+            
+        except (ValueError, OSError):
+            # Bad JSON / error bodies and network failures; SDK misuse still raises
+            prompt = _PROMPT_TEMPLATE.format(ids=ids, cur=currency)
+            
+            # Fall back to the LLM to fetch the data
+            result = json.loads(gl.exec_llm(prompt))
+            if not isinstance(result, dict):
+                return {}
+            
+            # Drop anything that isn't {"price": <number>, ...}
+            return {
+                coin_id: {
+                    "price": data["price"],
+                    "change_24h": data.get("change_24h") or 0
+                }
+                for coin_id, data in result.items()
+                if self._is_price_data(data)
+            }
+    
+    def _is_price_data(self, data):
+        """Check that fetched data is a dict carrying a numeric price."""
+        if not isinstance(data, dict):
+            return False
+        
+        price = data.get("price")
+        return isinstance(price, (int, float)) and not isinstance(price, bool)
+    
     @gl.public.view
     def get_multiple_prices(self, symbols, currency="usd"):
         """
         Get prices for multiple cryptocurrencies at once.
         
+        All supported symbols are fetched with a single CoinGecko request.
+        
         Args:
             symbols: List of crypto symbols (e.g., ["BTC", "ETH", "SOL"])
             currency: Target currency (default: "usd")
         
         Returns:
-            dict: Price data for all requested symbols
+            dict: Price data for all requested symbols, keyed as passed
         """
+        currency = currency.lower()
         results = {}
+        coin_ids = {}
         
+        # Validate symbols, keeping the caller's spelling and order as keys
         for symbol in symbols:
-            price_data = self.get_price(symbol, currency)
-            results[symbol] = price_data
+            if symbol in results:
+                continue
+            
+            upper = symbol.upper()
+            coin_id = self._COIN_IDS.get(upper)
+            if coin_id is None:
+                results[symbol] = {
+                    "success": False,
+                    "error": f"Unsupported symbol: {upper}",
+                    "supported_coins": self._SUPPORTED_LIST
+                }
+                continue
+            
+            # Placeholder keeps input order until the batch is fanned out
+            results[symbol] = None
+            coin_ids[symbol] = coin_id
+        
+        if coin_ids:
+            fetched_at = gl.block.timestamp
+            try:
+                # Only the CoinGecko IDs are deduped ("btc" and "BTC" share one)
+                ids = list(dict.fromkeys(coin_ids.values()))
+                fetched = self._fetch_prices(ids, currency)
+                error = None
+            except Exception as e:
+                fetched = {}
+                error = f"Failed to fetch price: {str(e)}"
+            
+            # Fan the batched response back out per symbol
+            for symbol, coin_id in coin_ids.items():
+                upper = symbol.upper()
+                price_data = fetched.get(coin_id)
+                
+                if not self._is_price_data(price_data):
+                    results[symbol] = {
+                        "success": False,
+                        "error": error or f"No price data returned for {upper}",
+                        "symbol": upper
+                    }
+                    continue
+                
+                results[symbol] = self._price_result(upper, currency, price_data, fetched_at)
         
         return {
             "success": True,
@@ -148,8 +257,10 @@ class PriceFeedLibrary(gl.Contract):
         Returns:
             dict: Comparison data
         """
-        price1_data = self.get_price(symbol1)
-        price2_data = self.get_price(symbol2)
+        # Fetch both prices with a single batched request
+        prices = self.get_multiple_prices([symbol1, symbol2])["prices"]
+        price1_data = prices[symbol1]
+        price2_data = prices[symbol2]
         
         if not price1_data.get("success") or not price2_data.get("success"):
             return {
@@ -183,8 +294,8 @@ class PriceFeedLibrary(gl.Contract):
         """
         return {
             "success": True,
-            "count": len(self.SUPPORTED_COINS),
-            "supported_coins": list(self.SUPPORTED_COINS.keys())
+            "count": len(self._SUPPORTED_LIST),
+            "supported_coins": self._SUPPORTED_LIST
         }
     
     @gl.public.view